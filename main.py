@@ -1,74 +1,170 @@
 import os
 import sys
+import hashlib
 import subprocess
+import importlib.util
+from pathlib import Path
 
 # --- Auto-install required packages ---
-required = ["stellar-sdk", "bip-utils", "requests", "mnemonic"]
-for pkg in required:
+required = ["stellar-sdk", "bip-utils", "requests", "mnemonic", "orjson"]
+# Sentinel records the last package list that was fully installed, so later runs skip the checks.
+# Packages are installed per interpreter, so each python/venv gets its own sentinel.
+interpreter_id = hashlib.sha256(sys.executable.encode("utf-8")).hexdigest()[:16]
+deps_sentinel = Path.home() / f".pi_forwarder_deps-{interpreter_id}"
+try:
+    deps_installed = deps_sentinel.read_text() == ",".join(required)
+except OSError:
+    deps_installed = False
+if not deps_installed:
+    for pkg in required:
+        if importlib.util.find_spec(pkg.replace("-", "_")) is None:
+            print(f"📦 Installing {pkg}...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
     try:
-        __import__(pkg.replace("-", "_"))
-    except ImportError:
-        print(f"📦 Installing {pkg}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
+        deps_sentinel.write_text(",".join(required))
+    except OSError:
+        pass  # e.g. read-only home: just check again on the next run
 
 # --- Imports after install ---
 import time
+import hmac
+import heapq
+import threading
+import struct
+import functools
+import unicodedata
+import orjson
 import requests
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
 from mnemonic import Mnemonic
-from bip_utils import Bip39SeedGenerator, Bip39MnemonicValidator, Bip44, Bip44Coins, Bip44Changes
-from stellar_sdk import Keypair, Server, TransactionBuilder, Asset, Network
+from bip_utils import Bip39MnemonicValidator, Bip44, Bip44Coins, Bip44Changes
+from stellar_sdk import Keypair, Server, TransactionBuilder, Asset, Network, Account, TransactionEnvelope
 from typing import Optional
 from stellar_sdk.operation import ClaimClaimableBalance
+from stellar_sdk.client.requests_client import RequestsClient
 
 # ---------------- CONFIG ----------------
 HORIZON_URL = "https://api.mainnet.minepi.com"
+PI_NETWORK_PASSPHRASE = "Pi Network"
 SAFE_WALLET = "MALYJFJ5SVD45FBWN2GT4IW67SEZ3IBOFSBSPUFCWV427NBNLG3PWAAAAAAAACJUHDSOY"
 DRY_RUN = False  # Real transactions enabled
+STRIKE_LEAD_SECS = 0.2  # Wake this long before an unlock to fire the claim
+LOCKS_FILE = Path.home() / ".pi_forwarder_locks.json"  # Known locks + Horizon cursor, per public key
+LOCK_RESYNC_SECS = 600  # Re-list all claimable balances this often to drop ones claimed elsewhere
 # ----------------------------------------
 
+# Shared HTTP session: keeps the TLS connection to Horizon alive between polls
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.05, status_forcelist=[502, 503, 504]),
+))
+SESSION.headers["Accept"] = "application/hal+json"
+SESSION.headers["Connection"] = "keep-alive"
+
+# Signed claim+forward XDRs waiting for their unlock, in unlock order: balance_id -> (xdr, amount, sequence)
+# Each strike takes the next sequence number after the one before it, so they only stay valid together
+PREPARED_STRIKES = {}
+
+# Transactions accepted by core but not yet ingested by Horizon. Until they land, Horizon reports
+# a stale sequence number, so new transactions continue from the last pending one instead.
+PENDING_TRANSACTIONS = {}  # tx_hash -> (public_key, sequence)
+PENDING_SEQUENCES = {}  # public_key -> highest pending sequence
+SEQUENCE_MUTEX = threading.Lock()
+
+# Balance ids whose claim is submitted but not yet confirmed, so later polls don't claim them twice
+CLAIMS_IN_FLIGHT = set()
+
+# Parsed locks from LOCKS_FILE: public_key -> {"cursor": paging_token, "records": {balance_id: [amt, unlock_time]}}
+LOCK_STATE = None
+LOCK_STATE_MUTEX = threading.Lock()
+LAST_LOCK_RESYNC = {}  # public_key -> time.monotonic() of the last full re-list in this process
+# Balance ids dropped by forget_locked_balance; a fetch that started before the drop must not re-add them
+FORGOTTEN_BALANCES = set()
+
+# One Horizon client for the whole process, riding on the pooled session above
+SERVER = Server(horizon_url=HORIZON_URL, client=RequestsClient(session=SESSION))
+
+# Worker threads for overlapping independent Horizon requests
+EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+def ttl_cache(ttl: float):
+    """Remember a function's result per argument tuple for `ttl` seconds"""
+    def decorator(func):
+        cache = {}
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            hit = cache.get(args)
+            if hit and time.monotonic() - hit[0] < ttl:
+                return hit[1]
+            result = func(*args)
+            cache[args] = (time.monotonic(), result)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+_COUNTDOWN_FORMATS = ("{3}s", "{2}m {3}s", "{1}h {2}m {3}s", "{0}d {1}h {2}m {3}s")
+
 def format_time_remaining(seconds: int) -> str:
     """Format seconds into human-readable countdown (days, hours, minutes, seconds)"""
     if seconds <= 0:
         return "READY NOW! ⚡"
     
-    days = int(seconds // 86400)
-    hours = int((seconds % 86400) // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    days, rest = divmod(int(seconds), 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
     
-    if days > 0:
-        return f"{days}d {hours}h {minutes}m {secs}s"
-    elif hours > 0:
-        return f"{hours}h {minutes}m {secs}s"
-    elif minutes > 0:
-        return f"{minutes}m {secs}s"
-    else:
-        return f"{secs}s"
+    # Index of the largest non-zero unit picks the format
+    idx = 3 if days else 2 if hours else 1 if minutes else 0
+    return _COUNTDOWN_FORMATS[idx].format(days, hours, minutes, secs)
 
+PI_DERIVATION_PATH = (44, 314159, 0)  # m/44'/314159'/0', all hardened
+
+def slip10_ed25519_key(seed: bytes, path=PI_DERIVATION_PATH) -> bytes:
+    """SLIP-0010 Ed25519 private key for a hardened path, using hashlib/hmac directly"""
+    digest = hmac.new(b"ed25519 seed", seed, hashlib.sha512).digest()
+    key, chain_code = digest[:32], digest[32:]
+    for index in path:
+        # Ed25519 only supports hardened children: 0x00 || key || ser32(index | 2^31)
+        data = b"\x00" + key + struct.pack(">L", index | 0x80000000)
+        digest = hmac.new(chain_code, data, hashlib.sha512).digest()
+        key, chain_code = digest[:32], digest[32:]
+    return key
+
+@functools.lru_cache(maxsize=4)  # PBKDF2 + SLIP-0010 is slow; don't repeat it for the same passphrase
 def mnemonic_to_keypair(mnemonic: str):
     """Convert Pi mnemonic to Ed25519 keypair using Pi Network's actual derivation method"""
-    from bip_utils import Bip32Slip10Ed25519
-    import nacl.signing
-    from stellar_sdk import StrKey
+    # Reject bad words / checksum exactly like the BIP-39 seed generator used to
+    Bip39MnemonicValidator().Validate(mnemonic)
+    
+    # BIP-39 seed: PBKDF2-HMAC-SHA512 over the NFKD-normalized words, salt "mnemonic"
+    words = " ".join(unicodedata.normalize("NFKD", word.lower()) for word in mnemonic.split())
+    seed_bytes = hashlib.pbkdf2_hmac("sha512", words.encode("utf-8"), b"mnemonic", 2048)
     
     # Pi Network uses SLIP-0010 Ed25519 derivation with path m/44'/314159'/0'
     # This is the exact method from the official Pi Network recovery tool
-    seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
-    private_key_bytes = Bip32Slip10Ed25519.FromSeed(seed_bytes).DerivePath("m/44'/314159'/0'").PrivateKey().Raw().ToBytes()
+    private_key_bytes = slip10_ed25519_key(seed_bytes)
     
     # Create Ed25519 keypair for Stellar SDK
     kp = Keypair.from_raw_ed25519_seed(private_key_bytes)
     return kp
 
+@ttl_cache(0.5)  # Ledgers close every few seconds; back-to-back lookups can share one response
 def get_available_balance(public_key: str) -> float:
     """Query Horizon account balance and calculate spendable amount"""
     url = f"{HORIZON_URL}/accounts/{public_key}"
     try:
-        resp = requests.get(url, timeout=30)
+        resp = SESSION.get(url, timeout=30)
         if resp.status_code != 200:
             return 0.0
-        data = resp.json()
+        data = orjson.loads(resp.content)
         
         # Get total balance
         total_balance = 0.0
@@ -93,74 +189,348 @@ def get_available_balance(public_key: str) -> float:
         print(f"💰 Total: {total_balance} Pi | Reserved: {total_reserves} Pi | Spendable: {spendable} Pi")
         return spendable
         
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"❌ Error fetching balance: {e}")
         return 0.0
 
+def _abs_before(leaf: dict) -> Optional[str]:
+    """Prefer Horizon's numeric abs_before_epoch over the ISO-8601 abs_before"""
+    return leaf.get("abs_before_epoch") or leaf.get("abs_before")
+
+def _locked_until(predicate: dict) -> Optional[str]:
+    """{"not": {"abs_before": T}}: locked until T (most common for Pi Network)"""
+    inner = predicate["not"]
+    return _abs_before(inner) if isinstance(inner, dict) else None
+
+def _available_until(predicate: dict) -> Optional[str]:
+    """{"abs_before": T}: available until T (less common)"""
+    return _abs_before(predicate)
+
+def _and_locked_until(predicate: dict) -> Optional[str]:
+    """{"and": [...]}: the first locked-until condition wins"""
+    conditions = predicate["and"]
+    if not isinstance(conditions, list):
+        return None
+    for condition in conditions:
+        if isinstance(condition, dict) and "not" in condition:
+            abs_before = _locked_until(condition)
+            if abs_before:
+                return abs_before
+    return None
+
+# Horizon only emits a handful of predicate shapes, so dispatch on the key set
+_PREDICATE_HANDLERS = {
+    frozenset({"not"}): _locked_until,
+    frozenset({"abs_before"}): _available_until,
+    frozenset({"abs_before", "abs_before_epoch"}): _available_until,
+    frozenset({"and"}): _and_locked_until,
+}
+
+MAX_UNLOCK_EPOCH = 253402300799  # 9999-12-31T23:59:59Z, the last second datetime/gmtime can format
+
+def parse_unlock_epoch(abs_before: str) -> float:
+    """Turn an abs_before value (epoch seconds or ISO-8601) into a POSIX timestamp"""
+    try:
+        epoch = float(abs_before)
+    except ValueError:
+        return datetime.fromisoformat(abs_before.replace("Z", "+00:00")).timestamp()
+    # "Never unlocks" predicates use values like int64 max; treat them as unparsable
+    if not 0 <= epoch <= MAX_UNLOCK_EPOCH:
+        raise ValueError(f"unlock time {abs_before} out of range")
+    return epoch
+
+def predicate_abs_before(predicate) -> Optional[str]:
+    """Extract the abs_before timestamp from a claimant predicate, if it has one"""
+    if not isinstance(predicate, dict):
+        return None
+    handler = _PREDICATE_HANDLERS.get(frozenset(predicate))
+    return handler(predicate) if handler else None
+
+def _lock_state() -> dict:
+    """Known locks, loaded from LOCKS_FILE on first use"""
+    global LOCK_STATE
+    if LOCK_STATE is None:
+        try:
+            LOCK_STATE = orjson.loads(LOCKS_FILE.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            LOCK_STATE = {}
+        # Files written before unlock times were range-checked can hold ones gmtime can't format
+        for entry in LOCK_STATE.values():
+            for lock in entry["records"].values():
+                if lock[1] is not None and not 0 <= lock[1] <= MAX_UNLOCK_EPOCH:
+                    lock[1] = None
+    return LOCK_STATE
+
+def _save_lock_state():
+    """Write the known locks back to LOCKS_FILE (caller holds LOCK_STATE_MUTEX)"""
+    try:
+        LOCKS_FILE.write_bytes(orjson.dumps(LOCK_STATE))
+    except OSError as e:
+        print(f"⚠️ Could not save lock cache: {e}")
+
+def forget_locked_balance(public_key: str, balance_id: str):
+    """Drop a claimed (or vanished) balance from the known locks"""
+    with LOCK_STATE_MUTEX:
+        FORGOTTEN_BALANCES.add(balance_id)
+        entry = _lock_state().get(public_key)
+        if entry and entry["records"].pop(balance_id, None) is not None:
+            _save_lock_state()
+    get_locked_balances.cache_clear()
+
+def _fetch_claimable_records(public_key: str, cursor: Optional[str]) -> Optional[list]:
+    """All claimable-balance records after `cursor` (from the start if None); None on failure"""
+    records = []
+    while True:
+        url = f"{HORIZON_URL}/claimable_balances?claimant={public_key}&order=asc&limit=200"
+        if cursor:
+            url += f"&cursor={cursor}"
+        try:
+            resp = SESSION.get(url, timeout=30)
+            if resp.status_code != 200:
+                return None
+            page = orjson.loads(resp.content).get("_embedded", {}).get("records", [])
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            print(f"❌ Error fetching locked balances: {e}")
+            return None
+        records.extend(page)
+        if len(page) < 200:
+            return records
+        cursor = page[-1]["paging_token"]
+
+@ttl_cache(5)  # New locks only appear at ledger close, so a few seconds of staleness is harmless
 def get_locked_balances(public_key: str):
     """Query claimable balances for locked Pi with balance IDs for claiming"""
-    url = f"{HORIZON_URL}/claimable_balances?claimant={public_key}"
-    try:
-        resp = requests.get(url, timeout=30)
-        if resp.status_code != 200:
-            return []
-        data = resp.json()
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error fetching locked balances: {e}")
-        return []
+    with LOCK_STATE_MUTEX:
+        entry = _lock_state().setdefault(public_key, {"cursor": None, "records": {}})
+        cursor = entry["cursor"]
+    
+    # Known locks are kept on disk, so normally only ask Horizon for balances created since the
+    # saved cursor. That never reports removals, so re-list everything every LOCK_RESYNC_SECS;
+    # the saved set is trusted until the first one.
+    last_resync = LAST_LOCK_RESYNC.setdefault(public_key, time.monotonic())
+    resync = time.monotonic() - last_resync >= LOCK_RESYNC_SECS
+    records = _fetch_claimable_records(public_key, None if resync else cursor)
+    if records is None:
+        # On failure we still report the locks we already know about
+        with LOCK_STATE_MUTEX:
+            return [(amt, unlock_time, balance_id) for balance_id, (amt, unlock_time) in entry["records"].items()]
     
-    locked = []
-    for record in data.get("_embedded", {}).get("records", []):
+    new_locks = {}
+    for record in records:
         amt = float(record["amount"])
         balance_id = record["id"]  # Critical for claiming!
         unlock_time = None
         
-        for claimant in record.get("claimants", []):
-            predicate = claimant.get("predicate", {})
-            abs_before = None
-            
-            # Handle different predicate structures more robustly
-            if isinstance(predicate, dict):
-                if "not" in predicate and isinstance(predicate["not"], dict) and "abs_before" in predicate["not"]:
-                    # Locked until abs_before time (most common for Pi Network)
-                    abs_before = predicate["not"]["abs_before"]
-                elif "abs_before" in predicate:
-                    # Available until abs_before time (less common)
-                    abs_before = predicate["abs_before"]
-                elif "and" in predicate:
-                    # Handle complex predicates with AND conditions
-                    and_conditions = predicate["and"]
-                    if isinstance(and_conditions, list):
-                        for condition in and_conditions:
-                            if isinstance(condition, dict) and "not" in condition and "abs_before" in condition.get("not", {}):
-                                abs_before = condition["not"]["abs_before"]
-                                break
-            
-            if abs_before:
-                try:
-                    unlock_time = datetime.fromisoformat(abs_before.replace("Z", "+00:00"))
-                except ValueError as e:
-                    print(f"⚠️ Could not parse unlock time '{abs_before}': {e}")
-                    unlock_time = None
+        # Only our own claimant's predicate decides when we can claim (others are e.g. the sender)
+        claimant = next((c for c in record.get("claimants", []) if c.get("destination") == public_key), None)
+        abs_before = predicate_abs_before(claimant.get("predicate", {})) if claimant else None
+        
+        if abs_before:
+            try:
+                # Keep it as an epoch float so the poll loop only does float math
+                unlock_time = parse_unlock_epoch(abs_before)
+            except ValueError as e:
+                print(f"⚠️ Could not parse unlock time '{abs_before}': {e}")
+                unlock_time = None
+        
+        new_locks[balance_id] = [amt, unlock_time]
+    
+    with LOCK_STATE_MUTEX:
+        # Claims confirmed while we were fetching stay dropped
+        for balance_id in FORGOTTEN_BALANCES.intersection(new_locks):
+            del new_locks[balance_id]
+        if resync:
+            # Anything Horizon no longer lists was claimed elsewhere (or is undated and gone)
+            entry["records"] = new_locks
+            LAST_LOCK_RESYNC[public_key] = time.monotonic()
+        else:
+            entry["records"].update(new_locks)
+        if records:
+            entry["cursor"] = records[-1]["paging_token"]
+        if resync or records:
+            _save_lock_state()
+        return [(amt, unlock_time, balance_id) for balance_id, (amt, unlock_time) in entry["records"].items()]
+
+def invalidate_balance_caches():
+    """Drop cached Horizon lookups so the next poll sees the effect of a submission"""
+    get_available_balance.cache_clear()
+    get_locked_balances.cache_clear()
+
+def next_account(public_key: str) -> Account:
+    """Source account for a new transaction, continuing after any submit that hasn't landed yet"""
+    with SEQUENCE_MUTEX:
+        pending = PENDING_SEQUENCES.get(public_key)
+    if pending is not None:
+        # No round-trip needed, and Horizon's sequence would be stale anyway; build() takes pending + 1
+        return Account(public_key, pending)
+    return SERVER.load_account(public_key)
+
+def has_pending_transactions(public_key: str) -> bool:
+    """True while a submitted transaction from this account is still waiting on ingest"""
+    with SEQUENCE_MUTEX:
+        return public_key in PENDING_SEQUENCES
+
+def _track_pending(tx_hash: str, xdr: str):
+    """Remember the sequence an accepted transaction consumed until Horizon ingests it"""
+    tx = TransactionEnvelope.from_xdr(xdr, PI_NETWORK_PASSPHRASE).transaction
+    public_key = tx.source.account_id
+    with SEQUENCE_MUTEX:
+        PENDING_TRANSACTIONS[tx_hash] = (public_key, tx.sequence)
+        PENDING_SEQUENCES[public_key] = max(PENDING_SEQUENCES.get(public_key, tx.sequence), tx.sequence)
+    return tx.sequence
+
+def _settle_transaction(tx_hash: str):
+    """Stop tracking a transaction once it's ingested (or given up on) so Horizon's sequence is used again"""
+    with SEQUENCE_MUTEX:
+        public_key, _ = PENDING_TRANSACTIONS.pop(tx_hash, (None, None))
+        if public_key and all(pk != public_key for pk, _ in PENDING_TRANSACTIONS.values()):
+            PENDING_SEQUENCES.pop(public_key, None)
+
+def submit_transaction_async(xdr: str) -> str:
+    """Submit via /transactions_async, returning the hash as soon as core accepts the transaction"""
+    resp = SESSION.post(f"{HORIZON_URL}/transactions_async", data={"tx": xdr}, timeout=5)
+    if resp.status_code == 404:
+        # Horizon without the async endpoint: fall back to the blocking submit
+        tx_hash = SERVER.submit_transaction(xdr)["hash"]
+        invalidate_balance_caches()
+        return tx_hash
+    
+    result = orjson.loads(resp.content)
+    if result.get("tx_status") in ("PENDING", "DUPLICATE"):
+        # Balances are only stale once Horizon ingests it; wait_for_transaction invalidates then
+        submitted_sequence = _track_pending(result["hash"], xdr)
+        # Prepared strikes assume they're the next transactions out; anything else sent in between
+        # has taken their sequence numbers, so they need re-signing
+        next_prepared = next(iter(PREPARED_STRIKES.values()), None)
+        if next_prepared and next_prepared[2] != submitted_sequence + 1:
+            PREPARED_STRIKES.clear()
+        return result["hash"]
+    raise RuntimeError(f"{result.get('tx_status', resp.status_code)}: {result.get('errorResultXdr', result)}")
+
+def wait_for_transaction(tx_hash: str, timeout: float = 30) -> Optional[dict]:
+    """Poll Horizon until a submitted transaction is ingested; returns the record if it succeeded"""
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            try:
+                resp = SESSION.get(f"{HORIZON_URL}/transactions/{tx_hash}", timeout=5)
+                if resp.status_code == 200:
+                    # Ingested, so the cached balances are now stale (even a failed transaction paid its fee)
+                    invalidate_balance_caches()
+                    record = orjson.loads(resp.content)
+                    return record if record.get("successful") else None
+            except (requests.exceptions.RequestException, orjson.JSONDecodeError):
+                pass
+            time.sleep(1)
+        return None
+    finally:
+        _settle_transaction(tx_hash)
+
+def watch_transaction(tx_hash: str, label: str, on_done=None):
+    """Log the final outcome of a submitted transaction without blocking the caller"""
+    def _watch():
+        confirmed = wait_for_transaction(tx_hash) is not None
+        if confirmed:
+            print(f"✅ {label} confirmed in ledger: {tx_hash[:16]}...")
+        else:
+            print(f"❌ {label} not confirmed: {tx_hash[:16]}...")
+        if on_done:
+            on_done(confirmed)
+    threading.Thread(target=_watch, daemon=True).start()
+
+def _claim_done(public_key: str, balance_id: str, confirmed: bool):
+    """A submitted claim settled: stop tracking the lock if it went through, otherwise allow a retry"""
+    CLAIMS_IN_FLIGHT.discard(balance_id)
+    if confirmed:
+        forget_locked_balance(public_key, balance_id)
+
+def prepare_strikes(kp: Keypair, upcoming: list, to_addr: str, sponsor_kp: Optional[Keypair] = None):
+    """Pre-build and sign claim+forward transactions so each strike is a single submit
+
+    upcoming is [(unlock_time, balance_id, amount)] sorted by unlock time; strikes get consecutive
+    sequence numbers in that order, since that's the order they'll be submitted in.
+    """
+    strikes = []
+    for unlock_time, balance_id, amount in upcoming:
+        transaction_fee_buffer = max(0.01, amount * 0.05)  # Same 5% / 0.01 Pi buffer as the live path
+        forward_amount = round(max(0, amount - transaction_fee_buffer), 6)
+        if forward_amount > 0:  # Too small to forward otherwise; the live path reports it at unlock
+            strikes.append((unlock_time, balance_id, amount, forward_amount))
+    
+    # Already-prepared strikes are only reusable while they're still the first ones due, in order
+    prepared_ids = list(PREPARED_STRIKES)
+    if prepared_ids != [balance_id for _, balance_id, _, _ in strikes[:len(prepared_ids)]]:
+        PREPARED_STRIKES.clear()
+    if len(strikes) == len(PREPARED_STRIKES):
+        return
+    
+    try:
+        if PREPARED_STRIKES:
+            account = Account(kp.public_key, list(PREPARED_STRIKES.values())[-1][2])
+        else:
+            account = next_account(kp.public_key)
         
-        locked.append((amt, unlock_time, balance_id))
-    return locked
+        for unlock_time, balance_id, amount, forward_amount in strikes[len(PREPARED_STRIKES):]:
+            # Upper bound only: the claim predicate already enforces the unlock, and a min_time would
+            # get the strike rejected because it fires just before the unlock ledger closes
+            unlock_epoch = int(unlock_time)
+            tx = (
+                TransactionBuilder(account, PI_NETWORK_PASSPHRASE, base_fee=300000)
+                .append_claim_claimable_balance_op(balance_id=balance_id)
+                .append_payment_op(destination=to_addr, asset=Asset.native(), amount=str(forward_amount))
+                .add_time_bounds(0, unlock_epoch + 60)
+                .build()  # Advances account.sequence for the next strike
+            )
+            tx.sign(kp)
+            if sponsor_kp:
+                tx.sign(sponsor_kp)
+            PREPARED_STRIKES[balance_id] = (tx.to_xdr(), amount, tx.transaction.sequence)
+            print(f"🎯 Lightning strike pre-signed for {amount} Pi (Balance ID: {balance_id[:8]}...)")
+    except Exception as e:
+        print(f"⚠️ Could not prepare lightning strike: {e}")
 
 def lightning_claim_and_forward(kp: Keypair, balance_id: str, to_addr: str, sponsor_kp: Optional[Keypair] = None):
     """ULTRA-FAST: Claim locked Pi and immediately forward it in ONE atomic transaction"""
-    server = Server(horizon_url=HORIZON_URL)
-    account = server.load_account(kp.public_key)
-    PI_NETWORK_PASSPHRASE = "Pi Network"
+    # Fast path: a transaction pre-signed by prepare_strikes only needs submitting
+    prepared = PREPARED_STRIKES.pop(balance_id, None)
+    if prepared:
+        xdr, claim_amount, _ = prepared
+        if DRY_RUN:
+            print("🚧 DRY_RUN: Pre-signed lightning strike ready")
+            print("Transaction XDR:", xdr[:50] + "...")
+            return
+        try:
+            tx_hash = submit_transaction_async(xdr)
+            print(f"🚀 LIGHTNING CLAIM & FORWARD SUBMITTED! TX: {tx_hash[:16]}...")
+            print(f"✅ {round(claim_amount - max(0.01, claim_amount * 0.05), 6)} Pi on its way to safe wallet in atomic transaction!")
+            CLAIMS_IN_FLIGHT.add(balance_id)
+            watch_transaction(tx_hash, "Lightning claim & forward", functools.partial(_claim_done, kp.public_key, balance_id))
+            return
+        except Exception as e:
+            # Usually a stale sequence number because another transaction went out first; the
+            # strikes prepared after this one were chained onto its sequence, so they're stale too
+            PREPARED_STRIKES.clear()
+            print(f"⚠️ Pre-signed strike rejected: {e}, rebuilding...")
+    
+    # Load the account and the balance info together so the strike waits on one round-trip, not two
+    balance_info_url = f"{HORIZON_URL}/claimable_balances/{balance_id}"
+    account_future = EXECUTOR.submit(next_account, kp.public_key)
+    balance_future = EXECUTOR.submit(SESSION.get, balance_info_url, timeout=5)
+    account = account_future.result()
     
     # Get balance info to know how much we're claiming
     claim_amount = 0
     try:
-        balance_info_url = f"{HORIZON_URL}/claimable_balances/{balance_id}"
-        resp = requests.get(balance_info_url, timeout=5)
+        resp = balance_future.result()
         if resp.status_code == 200:
-            balance_data = resp.json()
+            balance_data = orjson.loads(resp.content)
             claim_amount = float(balance_data["amount"])
             print(f"⚡ LIGHTNING CLAIM & FORWARD: {claim_amount} Pi (Balance ID: {balance_id[:8]}...)")
+        elif resp.status_code == 404:
+            # Already claimed - stop tracking it
+            print(f"⚠️ Balance {balance_id[:8]}... no longer exists, skipping claim")
+            forget_locked_balance(kp.public_key, balance_id)
+            return
         else:
             print("⚠️ Could not get balance info, will claim and forward whatever is available...")
     except Exception as e:
@@ -179,25 +549,17 @@ def lightning_claim_and_forward(kp: Keypair, balance_id: str, to_addr: str, spon
             
         print(f"💡 Will claim {claim_amount} Pi and forward {forward_amount} Pi (keeping {claim_amount - forward_amount} Pi for fees)")
         
-            # Build ATOMIC LIGHTNING transaction: Claim + Forward in ONE transaction
+        # Build ATOMIC LIGHTNING transaction: Claim + Forward in ONE transaction
         # Use sponsor to pay fees if main wallet has insufficient balance
         if sponsor_kp:
             print("💳 Using fee sponsor for claim+forward transaction fees")
-            tx = (
-                TransactionBuilder(account, PI_NETWORK_PASSPHRASE, base_fee=300000)  # Higher fee for 2 operations
-                .append_claim_claimable_balance_op(balance_id=balance_id)  # CLAIM FIRST
-                .append_payment_op(destination=to_addr, asset=Asset.native(), amount=str(forward_amount))  # FORWARD IMMEDIATELY
-                .set_timeout(15)  # Slightly longer for 2 operations
-                .build()
-            )
-        else:
-            tx = (
-                TransactionBuilder(account, PI_NETWORK_PASSPHRASE, base_fee=300000)  # Higher fee for 2 operations
-                .append_claim_claimable_balance_op(balance_id=balance_id)  # CLAIM FIRST
-                .append_payment_op(destination=to_addr, asset=Asset.native(), amount=str(forward_amount))  # FORWARD IMMEDIATELY
-                .set_timeout(15)  # Slightly longer for 2 operations
-                .build()
-            )
+        tx = (
+            TransactionBuilder(account, PI_NETWORK_PASSPHRASE, base_fee=300000)  # Higher fee for 2 operations
+            .append_claim_claimable_balance_op(balance_id=balance_id)  # CLAIM FIRST
+            .append_payment_op(destination=to_addr, asset=Asset.native(), amount=str(forward_amount))  # FORWARD IMMEDIATELY
+            .set_timeout(15)  # Slightly longer for 2 operations
+            .build()
+        )
     else:
         # Fallback: Just claim, then forward immediately (when amount unknown)
         print("🔄 Claiming first, will forward within 2 seconds...")
@@ -222,27 +584,26 @@ def lightning_claim_and_forward(kp: Keypair, balance_id: str, to_addr: str, spon
     
     # SUBMIT ATOMIC LIGHTNING TRANSACTION!
     try:
-        resp = server.submit_transaction(tx)
-        if resp.get('successful'):
-            print(f"🚀 LIGHTNING CLAIM & FORWARD SUCCESS! TX: {resp['hash'][:16]}...")
-            if claim_amount > 0:
-                print(f"✅ {round(claim_amount - max(0.01, claim_amount * 0.05), 6)} Pi forwarded to safe wallet in atomic transaction!")
-            else:
-                print("✅ Pi claimed! Forwarding immediately...")
-                # IMMEDIATE FORWARD after claim (fallback case)
-                time.sleep(1)  # Brief pause for network confirmation
-                forward_all(kp, to_addr, sponsor_kp)
+        tx_hash = submit_transaction_async(tx.to_xdr())
+        print(f"🚀 LIGHTNING CLAIM & FORWARD SUBMITTED! TX: {tx_hash[:16]}...")
+        if claim_amount > 0:
+            print(f"✅ {round(claim_amount - max(0.01, claim_amount * 0.05), 6)} Pi on its way to safe wallet in atomic transaction!")
+            CLAIMS_IN_FLIGHT.add(balance_id)
+            watch_transaction(tx_hash, "Lightning claim & forward", functools.partial(_claim_done, kp.public_key, balance_id))
         else:
-            print(f"❌ Lightning claim failed: {resp.get('extras', {}).get('result_codes', resp)}")
-            # Don't call forward_all here as the claim failed
+            print("✅ Pi claim accepted! Forwarding as soon as it lands...")
+            # IMMEDIATE FORWARD after claim (fallback case) - the claimed Pi must be in the ledger first
+            if wait_for_transaction(tx_hash):
+                forget_locked_balance(kp.public_key, balance_id)
+                forward_all(kp, to_addr, sponsor_kp)
+            else:
+                print("❌ Lightning claim failed to confirm")
     except Exception as e:
         print(f"❌ Lightning transaction error: {e}")
 
 def build_sponsored_transaction(source_kp: Keypair, sponsor_kp: Optional[Keypair], to_addr: str, amount: str):
     """Build a fee-sponsored transaction where sponsor pays fees"""
-    server = Server(horizon_url=HORIZON_URL)
-    source_account = server.load_account(source_kp.public_key)
-    PI_NETWORK_PASSPHRASE = "Pi Network"
+    source_account = next_account(source_kp.public_key)
     
     # Build transaction with sponsor as fee source
     tx = (
@@ -261,10 +622,14 @@ def build_sponsored_transaction(source_kp: Keypair, sponsor_kp: Optional[Keypair
 
 def forward_all(kp: Keypair, to_addr: str, sponsor_kp: Optional[Keypair] = None):
     """Send all available Pi to safe wallet"""
-    server = Server(horizon_url=HORIZON_URL)
-    account = server.load_account(kp.public_key)
-
+    if has_pending_transactions(kp.public_key):
+        # Horizon's balance doesn't reflect the pending transaction yet, so forwarding now would double-spend
+        print("⏳ Previous transaction still pending - forwarding once it lands")
+        return
+    
+    account_future = EXECUTOR.submit(next_account, kp.public_key)
     bal = get_available_balance(kp.public_key)
+    account = account_future.result()
     # Now 'bal' is already the spendable amount (reserves already subtracted)
     # Just need to leave some for transaction fees
     transaction_fee = 0.01  # Small buffer for transaction fees
@@ -290,7 +655,6 @@ def forward_all(kp: Keypair, to_addr: str, sponsor_kp: Optional[Keypair] = None)
             return
         print(f"🚀 Sending {amt} Pi (keeping {round(bal - amt, 6)} Pi for transaction fees)")
         
-        PI_NETWORK_PASSPHRASE = "Pi Network"
         tx = (
             TransactionBuilder(account, PI_NETWORK_PASSPHRASE, base_fee=100000)
             .append_payment_op(destination=to_addr, asset=Asset.native(), amount=str(amt))
@@ -303,8 +667,14 @@ def forward_all(kp: Keypair, to_addr: str, sponsor_kp: Optional[Keypair] = None)
         print("🚧 DRY_RUN active — transaction not sent")
         print("Signed XDR:", tx.to_xdr())
     else:
-        resp = server.submit_transaction(tx)
-        print("✅ Transaction broadcast:", resp)
+        try:
+            tx_hash = submit_transaction_async(tx.to_xdr())
+        except Exception as e:
+            # e.g. the balance changed since it was read, or another wallet app used this sequence number
+            print(f"❌ Forward rejected: {e}")
+            return
+        print("✅ Transaction broadcast:", tx_hash)
+        watch_transaction(tx_hash, "Forward")
 
 def main():
     print("=== Pi Auto Forwarder ===")
@@ -334,47 +704,62 @@ def main():
 
     while True:
         try:
-            avail = get_available_balance(kp.public_key)
-            locked = get_locked_balances(kp.public_key)
+            # Fetch balance and locks in parallel so a poll costs one round-trip, not two
+            avail_future = EXECUTOR.submit(get_available_balance, kp.public_key)
+            locked_future = EXECUTOR.submit(get_locked_balances, kp.public_key)
+            avail = avail_future.result()
+            locked = locked_future.result()
 
             if avail > 0.01:
                 print(f"⚡ {avail} Pi available — forwarding now...")
                 forward_all(kp, SAFE_WALLET, sponsor_kp)
 
             # LIGHTNING CLAIMING LOGIC
-            soonest = None
-            soonest_balance_id = None
-            current_time = datetime.now(timezone.utc)
+            current_time = time.time()
             total_locked_pi = sum(amt for amt, _, _ in locked) if locked else 0
             
             if locked:
                 print(f"📊 MONITORING: {len(locked)} locked balance(s) totaling {total_locked_pi} Pi")
             
-            for amt, unlock_time, balance_id in locked:
-                if unlock_time:
-                    delta = (unlock_time - current_time).total_seconds()
-                    time_remaining = format_time_remaining(delta)
-                    
-                    if delta <= 30:  # If unlocking in next 30 seconds, start monitoring closely
-                        print(f"🔥 READY TO CLAIM: {amt} Pi unlocking in {time_remaining} - PREPARING LIGHTNING STRIKE!")
-                        if delta <= 0.5:  # Already unlocked or unlocking in next 0.5 seconds!
-                            print(f"⚡⚡⚡ EXECUTING LIGHTNING CLAIM NOW! {amt} Pi")
-                            lightning_claim_and_forward(kp, balance_id, SAFE_WALLET, sponsor_kp)
-                            continue  # Skip to next balance
-                    
-                    if delta > 0:
-                        print(f"🔒 {amt} Pi unlocks at {unlock_time.strftime('%Y-%m-%d %H:%M:%S UTC')} ⏳ ({time_remaining} remaining)")
-                        if soonest is None or unlock_time < soonest:
-                            soonest = unlock_time
-                            soonest_balance_id = balance_id
-
-            if soonest:
-                sleep_secs = max(0, (soonest - current_time).total_seconds())
+            # Min-heap on unlock time, rebuilt from each poll's locks: the next lock to fire is always heap[0]
+            # Locks whose claim is still in flight are skipped until it settles
+            heap = [
+                (unlock_time, balance_id, amt) for amt, unlock_time, balance_id in locked
+                if unlock_time is not None and balance_id not in CLAIMS_IN_FLIGHT
+            ]
+            heapq.heapify(heap)
+            
+            while heap and heap[0][0] - current_time <= 0.5:  # Already unlocked or unlocking in next 0.5 seconds!
+                unlock_time, balance_id, amt = heapq.heappop(heap)
+                print(f"🔥 READY TO CLAIM: {amt} Pi unlocking in {format_time_remaining(unlock_time - current_time)} - PREPARING LIGHTNING STRIKE!")
+                print(f"⚡⚡⚡ EXECUTING LIGHTNING CLAIM NOW! {amt} Pi")
+                lightning_claim_and_forward(kp, balance_id, SAFE_WALLET, sponsor_kp)
+            
+            # The heap itself is only partially ordered, so sort the rest for display and strike order
+            remaining = sorted(heap)
+            
+            # If unlocking in next 30 seconds, sign ahead of time so the strike is just a submit
+            upcoming = [entry for entry in remaining if entry[0] - current_time <= 30]
+            if upcoming:
+                prepare_strikes(kp, upcoming, SAFE_WALLET, sponsor_kp)
+            
+            for unlock_time, balance_id, amt in remaining:
+                delta = unlock_time - current_time
+                time_remaining = format_time_remaining(delta)
+                
+                if delta <= 30:  # If unlocking in next 30 seconds, start monitoring closely
+                    print(f"🔥 READY TO CLAIM: {amt} Pi unlocking in {time_remaining} - PREPARING LIGHTNING STRIKE!")
+                
+                print(f"🔒 {amt} Pi unlocks at {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime(unlock_time))} ⏳ ({time_remaining} remaining)")
+
+            if heap:
+                soonest = heap[0][0]
+                sleep_secs = max(0, soonest - current_time)
                 next_unlock_countdown = format_time_remaining(sleep_secs)
                 
-                if sleep_secs <= 10:  # If unlocking soon, check every second for maximum speed
-                    print(f"🔥 LIGHTNING MODE: Checking every second - {next_unlock_countdown} until STRIKE!")
-                    time.sleep(1)
+                if sleep_secs <= 10:  # If unlocking soon, wake right before the unlock instead of polling
+                    print(f"🔥 LIGHTNING MODE: Sleeping until STRIKE - {next_unlock_countdown} to go!")
+                    time.sleep(max(0, sleep_secs - STRIKE_LEAD_SECS))
                 elif sleep_secs <= 60:  # If unlocking soon, check every 5 seconds
                     print(f"⚡ SPEED MODE: Checking every 5s - {next_unlock_countdown} until unlock")
                     time.sleep(5)